@@ -30,6 +30,11 @@ import dill as pickle
 import numpy as np
 import h5py
 
+try:
+    unicode
+except NameError: # python 3
+    unicode = str
+
 dict_id2word = None
 i2w_ufunc = None
 logger = logging
@@ -153,7 +158,7 @@ class Storer(object):
         """
         ## Assuming all arrays have same rank, find the max dims
         shapes = [ar.shape for ar in np_ar_list]
-        dims = zip(*shapes)
+        dims = list(zip(*shapes))
         max_shape = [max(d) for d in dims]
         ## We'll concatenate all arrays along axis=batch_axis
         max_shape[batch_axis] = sum(dims[batch_axis])
@@ -185,7 +190,7 @@ def makeLogfileName(logdir, name):
     if not (prefix + ext) in filenames:
         return os.path.join(logdir, prefix + ext)
     else:
-        for i in xrange(2,101):
+        for i in range(2,101):
             if '%s_%d%s'%(prefix,i,ext) not in filenames:
                 return os.path.join(logdir, '%s_%d%s'%(prefix,i,ext))
 
@@ -217,13 +222,13 @@ def readlines_to_df(path, colname):
     rows = []
     n = 0
     with open(path, 'r') as f:
-        print 'opened file %s'%path
+        print('opened file %s'%path)
         for line in f:
             n += 1
             line = line.strip()  # remove \n
             if len(line) > 0:
                 rows.append(line.encode('utf-8'))
-    print 'processed %d lines resulting in %d rows'%(n, len(rows))
+    print('processed %d lines resulting in %d rows'%(n, len(rows)))
     return pd.DataFrame({colname:rows}, dtype=np.str_)
 
 
@@ -231,13 +236,13 @@ def readlines_to_sr(path):
     rows = []
     n = 0
     with open(path, 'r') as f:
-        print 'opened file %s'%path
+        print('opened file %s'%path)
         for line in f:
             n += 1
             line = line.strip()  # remove \n
             if len(line) > 0:
                 rows.append(line.encode('utf-8'))
-    print 'processed %d lines resulting in %d rows'%(n, len(rows))
+    print('processed %d lines resulting in %d rows'%(n, len(rows)))
     return pd.Series(rows, dtype=np.str_)
 
 
@@ -530,7 +530,7 @@ def split_dataset(df_, batch_size_, logger, args, assert_whole_batch=True, valid
         df_validation = None
         if (num_val_batches > 0):
             val_bin_counts = get_bin_counts(val_batches)
-            for bin_len, num_batches in val_bin_counts.iteritems():
+            for bin_len, num_batches in val_bin_counts.items():
                 df_val_bin = df_[df_.bin_len == bin_len].iloc[:num_batches*batch_size_]
                 df_validation = df_val_bin if df_validation is None else df_validation.append(df_val_bin)
 
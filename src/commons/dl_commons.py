@@ -17,16 +17,27 @@
     You should have received a copy of the Affero GNU General Public License
     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-Tested on python 2.7
+Tested on python 2.7. Also compiles and passes dl_commons_tests on python 3.
 
 @author: Sumeet S Singh
 """
-import collections
+import sys
 import pprint
 import numpy as np
 import nltk
 import data_commons as dtc
 
+if sys.version_info[0] >= 3:
+    from collections.abc import Sequence, MutableSequence, MutableMapping, MutableSet
+    _string_types = str
+    _text_type = str
+    _intern = sys.intern
+else:
+    from collections import Sequence, MutableSequence, MutableMapping, MutableSet
+    _string_types = basestring
+    _text_type = unicode
+    _intern = intern
+
 class AccessDeniedError(Exception):
     def __init__(self, msg):
         Exception.__init__(self, msg)
@@ -47,7 +58,7 @@ class Properties(dict):
     Additionally, you my call freeze() or seal() to freeze or seal
     the dictionary - just as in Javascript.
     The class inherits from dict therefore all standard python dictionary interfaces
-    are available as well (such as iteritems etc.)
+    are available as well (such as items etc.)
 
     x = Properties({'x':1, 2:'y'})
     assert d.x == d['x']
@@ -61,6 +72,9 @@ class Properties(dict):
     d[4] = 'a' # raises AccessDeniedError
     d[2] = 'a' # raises AccessDeniedError
     """
+    # The freeze/seal flags live in slots so that reading them is a C-level member access
+    # instead of an instance-dictionary lookup. Property values are stored in the dict itself.
+    __slots__ = ('_isFrozen', '_isSealed')
 
     def __init__(self, d={}):
         dict.__init__(self, d)
@@ -94,17 +108,33 @@ class Properties(dict):
         except KeyError:
             return None
 
+    def _rvd(self, key, default):
+        """
+        For internal use only - needed by Params.__init__.
+        returns the raw dictionary value or default if the key is absent
+        """
+        return dict.get(self, key, default)
+
     def _set_val_(self, key, val):
-        if self.isFrozen():
+        if self._isFrozen:
             raise AccessDeniedError('Object is frozen, therefore key "%s" cannot be modified'%(key,))
-        elif self.isSealed() and key not in dict.keys(self):
+        elif self._isSealed and not dict.__contains__(self, key):
             raise AccessDeniedError('Object is sealed, new key "%s" cannot be added'%(key,))
         else:
             dict.__setitem__(self, key, val)
 
     def __copy__(self):
-        ## Shallow copy
-        return self.__class__(self)
+        ## Shallow copy. Bypasses __init__ and therefore does not re-validate the values. The copy is not
+        ## frozen but remains sealed if this object was sealed.
+        cls = self.__class__
+        new = cls.__new__(cls)
+        dict.update(new, self)
+        object.__setattr__(new, '_isFrozen', False)
+        object.__setattr__(new, '_isSealed', self._isSealed)
+        if cls.__dictoffset__:
+            ## subclass without __slots__
+            object.__getattribute__(new, '__dict__').update(object.__getattribute__(self, '__dict__'))
+        return new
 
     def __getstate__(self):
         """
@@ -187,7 +217,7 @@ class Properties(dict):
                 for i, v in enumerate(val, start=1):
                     name = '%s.%d'%(row_name,i)
                     if not isinstance(v, Properties):
-                        rows.append([name, unicode(v)])
+                        rows.append([name, _text_type(v)])
                     else:
                         rows.extend(v.to_table(name))
             # elif isinstance(val, dict):
@@ -205,30 +235,33 @@ class Properties(dict):
     def pformat(self):
         return pprint.pformat(to_picklable_dict(self))
 
-    def __getattr__(self, key):
-        return self._get_val_(key)
-
-    def __setattr__(self, key, val):
-        return self._set_val_(key, val)
-
-    def __getitem__(self, key):
-        return self._get_val_(key)
-
-    def __setitem__(self, key, val):
-        return self._set_val_(key, val)
+    ## The accessors are bound directly to _get_val_/_set_val_ instead of forwarding to them
+    ## so that each property access costs one python call instead of two. Therefore, a subclass
+    ## that overrides _get_val_ or _set_val_ must rebind the corresponding accessors as well.
+    __getattr__ = __getitem__ = _get_val_
+    __setattr__ = __setitem__ = _set_val_
 
     def isFrozen(self):
-        return object.__getattribute__(self, '_isFrozen')
+        return self._isFrozen
 
     def isSealed(self):
-        return object.__getattribute__(self, '_isSealed')
+        return self._isSealed
 
     def freeze(self):
         object.__setattr__(self, '_isFrozen', True)
         return self
 
     def seal(self):
-        object.__setattr__(self, '_isSealed', True)
+        if not self._isSealed:
+            ## The set of keys is fixed from here on. Re-key the dictionary with interned strings so that
+            ## lookups by attribute name (always interned) match on the pointer comparison fast-path.
+            ## Only done if needed, since it may change the iteration order (python 2). Keys of Params
+            ## objects are always interned (see ParamDesc) and frozen objects are left alone.
+            if (not self._isFrozen) and any((type(k) is str) and (_intern(k) is not k) for k in dict.keys(self)):
+                items = [((_intern(k) if type(k) is str else k), v) for k, v in dict.items(self)]
+                dict.clear(self)
+                dict.update(self, items)
+            object.__setattr__(self, '_isSealed', True)
         return self
 
 class NoneProperties(Properties):
@@ -236,20 +269,28 @@ class NoneProperties(Properties):
     A variation of Properties which will silently return a None value for missing keys instead of throwing
     an exception.
     """
+    __slots__ = ()
+
     def _get_val_(self, key):
         try:
             return Properties._get_val_(self, key)
         except KeyError:
             return None
 
+    __getattr__ = __getitem__ = _get_val_
+
 class Undefined(object):
     pass
 _undefined = Undefined()
 
-class ParamDesc(Properties):
+class ParamDesc(object):
     """
     A property descriptor.
+    The descriptor's fields are held in slots (rather than in a Properties dictionary) because they
+    are read on every construction, read and write of a Params object.
     """
+    __slots__ = ('name', 'text', 'validator', 'default')
+
     def __init__(self, name, text, validator=None, default=_undefined):
         """
         @name = name of property,
@@ -260,23 +301,35 @@ class ParamDesc(Properties):
         @default = value (optional) stands for the default value. Set to None if
             unspecified.
 
-        The object gets immediately frozen after
+        The object is immutable after
         initialization so that the property descriptor can be re-used repeatedly
         without fear of modification.
         """
 
         if isMutable(default):
             raise AttributeError('ParamDesc.default values must be immutable! Property name: %s.'%name)
+        ## Default values are validated once here rather than every time a Params object is constructed.
+        ## LambdaVals get validated when they are resolved.
+        if ((default is not _undefined) and (validator is not None) and (not isinstance(default, LambdaVal))
+                and (default not in validator)):
+            raise ParamsValueError('%s is not a valid default value of property %s'%(default, name))
+
+        ## The name becomes a key of every Params dictionary built from this descriptor, hence it is
+        ## interned - for the reason explained in Properties.seal.
+        object.__setattr__(self, 'name', _intern(name) if type(name) is str else name)
+        object.__setattr__(self, 'text', text)
+        object.__setattr__(self, 'validator', validator)
+        ## _undefined stands for 'no default value'. None is a legitimate default value.
+        object.__setattr__(self, 'default', default)
 
-        if default == _undefined:
-            Properties.__init__(self, {'name':name, 'text':text, 'validator':validator})
-        else:
-            # if default is None:
-            #     print 'WARNING: Setting None default value for property %s'%name
-
-            Properties.__init__(self, {'name':name, 'text':text, 'validator':validator, 'default':default})
+    def __setattr__(self, key, val):
+        raise AccessDeniedError('ParamDesc is immutable, therefore key "%s" cannot be modified'%(key,))
 
-        self.freeze()
+    def __repr__(self):
+        if self.defaultIsSet():
+            return 'ParamDesc(%r, %r, %r, %r)'%(self.name, self.text, self.validator, self.default)
+        else:
+            return 'ParamDesc(%r, %r, %r)'%(self.name, self.text, self.validator)
 
     # def defaultIsSet(self):
     #     """
@@ -295,7 +348,7 @@ class ParamDesc(Properties):
         """
         Returns True if a default value has been set else returns False.
         """
-        return 'default' in self
+        return self.default is not _undefined
 
 ## A shorter alias of ParamDesc
 PD = ParamDesc
@@ -325,6 +378,7 @@ class Params(Properties):
     This class is used to define and store descriptors of a model. It inherits
     from class Properties.
     """
+    __slots__ = ('_do_assert_one_val', '_descr_list', '_descr_dict', '_mandatory_names', '_checks', '_numba_dict')
 
     def __init__(self, prototype, initVals=None, seal=False, assert_one_val=False):
         """
@@ -379,9 +433,9 @@ class Params(Properties):
                     [
                      ParamDesc('model_name', 'Name of Model', None, 'im2latex'),
                      ParamDesc('layer_type', 'Type of layers to be created'),
-                     ParamDesc('num_layers', 'Number of layers. Defaults to 1', xrange(1,101), 1),
+                     ParamDesc('num_layers', 'Number of layers. Defaults to 1', range(1,101), 1),
                      ParamDesc('num_units', 'Number of units per layer. Defaults to 10000 / num_layers',
-                               xrange(1, 10000),
+                               range(1, 10000),
                                lambda name, props: 10000 // props["num_layers"]), ## Lambda function will be invoked
                      ParamDesc('activation_fn', 'tensorflow activation function',
                                iscallable(tf.nn.relu, tf.nn.tanh, None),
@@ -399,6 +453,7 @@ class Params(Properties):
         vals_init_ = Properties()
         vals_params_ = Properties()
         _vals = {}
+        user_supplied = set() # names of properties whose values came from initVals
 
         if initVals is not None:
             vals_init_ = initVals if isinstance(initVals, Properties) else Properties(initVals)
@@ -419,14 +474,19 @@ class Params(Properties):
                         vals = self._assert_one_val(name, [vals_init_, vals_params_], desc)
                         if len(vals) > 0:
                             _vals[name] = self._assert_immutable(vals[0], name)
+                            if name in vals_init_:
+                                user_supplied.add(name)
                         # else do not insert key into dictionary
                     else:
-                        if name in vals_init_:
-                            _vals[name] = self._assert_immutable(vals_init_._rv(name), name)
-                        elif name in vals_params_:
-                            _vals[name] = self._assert_immutable(vals_params_._rv(name), name)
-                        elif desc.defaultIsSet():
-                            _vals[name] = self._assert_immutable(desc.default, name)
+                        val = vals_init_._rvd(name, _undefined)
+                        if val is not _undefined:
+                            user_supplied.add(name)
+                        else:
+                            val = vals_params_._rvd(name, _undefined)
+                            if val is _undefined:
+                                val = desc.default
+                        if val is not _undefined:
+                            _vals[name] = self._assert_immutable(val, name)
                         # else do not insert key into dictionary
 
                 except:
@@ -435,15 +495,19 @@ class Params(Properties):
             else:
                 raise ParamsValueError('property %s has already been initialized with value %s'%(name, _vals[name]))
 
-        object.__setattr__(self, '_descr_dict', descrs.freeze())
+        self._set_descriptors(descrs)
 
-        # Validation: Now insert the property values one by one. Doing so will invoke
-        # self._set_val_ which will validate the values.
+        # Validation: Now insert the property values one by one. Values supplied by initVals are inserted
+        # via self._set_val_ which will validate them. Values taken from the prototype have already been
+        # validated - default values by ParamDesc and the others by the prototype Params object - therefore
+        # they are inserted directly.
         for desc in descriptors:
             try:
                 _name = desc.name
-                if _name in _vals:
+                if _name in user_supplied:
                     self[_name] = _vals[_name]
+                elif _name in _vals:
+                    dict.__setitem__(self, _name, _vals[_name])
             except ParamsValueError:
                 raise
             except:
@@ -454,6 +518,27 @@ class Params(Properties):
         if seal:
             self.seal()
 
+    def __copy__(self):
+        ## Shallow copy. The (immutable) descriptor tables are shared with the copy. The cached numba dict
+        ## is not, since the copy is not frozen.
+        new = Properties.__copy__(self)
+        for name in Params.__slots__:
+            if name != '_numba_dict':
+                object.__setattr__(new, name, object.__getattribute__(self, name))
+        return new
+
+    def _set_descriptors(self, descrs):
+        """
+        Installs the descriptor dictionary and precomputes the lookup tables derived from it
+        so that they need not be recomputed on every property access.
+        """
+        object.__setattr__(self, '_descr_dict', descrs.freeze())
+        object.__setattr__(self, '_checks', dict((name, _compile_validator(desc.validator)) for name, desc in descrs.items()))
+        ## Names of properties whose validator does not admit None
+        object.__setattr__(self, '_mandatory_names',
+                           frozenset(name for name, desc in descrs.items()
+                                     if (desc.validator is None) or (None not in desc.validator)))
+
     @staticmethod
     def _assert_immutable(val, name):
         ## warn if doing shallow-copy of a dictionary
@@ -501,19 +586,19 @@ class Params(Properties):
         Actual _set_val_ implementation separated out so that internal and external invocations may be distinguished.
         """
         # Polymorphic override of _set_val_. Be mindful of recursion.
-        protoD = self.protoD
+        check = self._checks.get(name, _undefined)
 
-        if not self.isValidName(name):
+        if check is _undefined:
             raise KeyError('%s is not an allowed property name'%(name,))
         elif self._do_assert_one_val and (name in self) and (val != self[name]):
             raise OneValError('%s._set_val_: Attempt to change the existing value of %s\nOld Value=\n%s\nNew Value=\n%s' %
                             (self.__class__.__name__, name, self[name], val))
-        # elif (val is not None) and (not isinstance(val, LambdaVal)) and (protoD[name].validator is not None) and (val not in protoD[name].validator):
-        elif (not isinstance(val, LambdaVal)) and (protoD[name].validator is not None) and (val not in protoD[name].validator):
+        elif (check is not None) and (not isinstance(val, LambdaVal)) and (not _passes_check(check, val)):
             raise ParamsValueError('%s is not a valid value of property %s'%(val, name))
-        else:
-            return Properties._set_val_(self, name, val)
 
+        return Properties._set_val_(self, name, val)
+
+    __setattr__ = __setitem__ = _set_val_
 
     def _resolve_raw_val(self, name, val):
         """Check to see if a value is dynamic and resolve it if so. """
@@ -523,6 +608,11 @@ class Params(Properties):
 
     def _resolve_raw_vals(self, name, vals_, doValidate=True):
         """ Resolve a single (possibly lambda) val or sequence of (possibly lambda) vals. """
+        # Keys written via dict.update (update, updated, copy) bypass the name check of _set_val_.
+        check = self._checks.get(name, _undefined)
+        if check is _undefined:
+            raise KeyError('%s is not an allowed property name'%(name,))
+
 #        if isTupleOrList(vals_):
         if issequence(vals_):
             vals_l = [self._resolve_raw_val(name, val) for val in vals_]
@@ -531,8 +621,7 @@ class Params(Properties):
             vals = self._resolve_raw_val(name, vals_)
 
         if doValidate:
-            protoD = self.protoD
-            if (vals is not None) and (protoD[name].validator is not None) and (vals not in protoD[name].validator):
+            if (vals is not None) and (check is not None) and (not _passes_check(check, vals)):
                 raise ParamsValueError('%s is not a valid value of property %s'%(vals, name))
 
         return vals
@@ -553,22 +642,70 @@ class Params(Properties):
             return None
 
     def _get_val_helper(self, name, doValidate):
-        if not self.isValidName(name):
-            raise KeyError('%s is not an allowed property name'%(name,))
-        else:
-            val = Properties._get_val_(self, name)
-            return self._resolve_raw_vals(name, val, doValidate)
+        # Names found in the dictionary are checked by _resolve_raw_vals (they could have been inserted
+        # by dict.update, bypassing _set_val_), hence here the name needs to be checked only when the lookup fails.
+        try:
+            val = dict.__getitem__(self, name)
+        except KeyError:
+            if not self.isValidName(name):
+                raise KeyError('%s is not an allowed property name'%(name,))
+            raise KeyError('property %s was not set'%(name,))
+        return self._resolve_raw_vals(name, val, doValidate)
 
     def _get_val_(self, name):
         """ Resolves and validates values returned by Properties._get_val_ """
         return self._get_val_helper(name, doValidate=True)
 
+    __getattr__ = __getitem__ = _get_val_
+
     def _get_unvalidated_val(self, name):
         """ Resolves but does not validate values returned by Properties._get_val_ """
         return self._get_val_helper(name, doValidate=False)
 
     def isValidName(self, name):
-        return name in self.protoD
+        # self._descr_dict is a slot, hence reading it directly skips the protoD property call
+        return name in self._descr_dict
+
+    def to_numba_dict(self):
+        """
+        Returns the numeric (int, float and bool) property values as a numba.typed.Dict of unicode to float64
+        so that they may be passed into numba nopython (@njit) functions. Unset and non-numeric properties
+        are left out. Requires numba. The dictionary is cached once the object is frozen, hence do not
+        modify it. (update and updated, which can modify a frozen object, discard the cached dictionary.)
+        """
+        try:
+            return object.__getattribute__(self, '_numba_dict')
+        except AttributeError:
+            pass
+
+        from numba import types
+        from numba.typed import Dict
+        d = Dict.empty(key_type=types.unicode_type, value_type=types.float64)
+        for desc in self.protoS:
+            try:
+                val = self._get_val_(desc.name)
+            except KeyError:
+                continue
+            if isinstance(val, (bool, int, float, np.number, np.bool_)):
+                d[desc.name] = float(val)
+
+        if self._isFrozen:
+            object.__setattr__(self, '_numba_dict', d)
+        return d
+
+    def _discard_numba_dict(self):
+        try:
+            object.__delattr__(self, '_numba_dict')
+        except AttributeError:
+            pass
+
+    def update(self, other):
+        self._discard_numba_dict()
+        Properties.update(self, other)
+
+    def updated(self, other):
+        self._discard_numba_dict()
+        return Properties.updated(self, other)
 
     def append(self, other):
         assert isinstance(other, Params)
@@ -580,7 +717,7 @@ class Params(Properties):
         for param in other.protoS:
             protoD[param.name] = param
             self.protoS.append(param)
-        object.__setattr__(self, '_descr_dict', protoD.freeze())
+        self._set_descriptors(protoD)
 
         ## Update values
         for param in other.protoS:
@@ -677,32 +814,49 @@ class HyperParams(Params):
         If you want to lazily set the value of a hyper-parameter, then leave it unset at first (for e.g.
         do not provide a value in the parameter's prototype).
     """
+    __slots__ = ()
 
     def __init__(self, prototype, initVals=None, seal=False, assert_one_val=False):
         Params.__init__(self, prototype, initVals, seal, assert_one_val=True)
 
     def __contains__(self, name):
         """ Handles None values in a special way as stated above. """
-        try:
-            self._get_val_(name)
-            return True
-        except KeyError:
+        # Decided from the raw value where possible in order to avoid raising and catching KeyError.
+        val = dict.get(self, name, _undefined)
+        if (val is _undefined) or (name not in self._checks):
+            ## Absent or undeclared (inserted via dict.update) - _get_val_ would raise KeyError
             return False
+        elif val is None:
+            return name not in self._mandatory_names
+        elif isinstance(val, LambdaVal):
+            ## Only the resolved value can tell
+            try:
+                self._get_val_(name)
+                return True
+            except KeyError:
+                return False
+        else:
+            return True
 
     def _get_val_(self, name):
         """ Polymorphic override of _get_val_ """
         # Be mindful of recursion.
         val = Params._get_val_(self, name)
-        validator = self.protoD[name].validator
-        if (val == None) and ((validator is None) or (None not in validator)):
+        if (val is None) and (name in self._mandatory_names):
             raise KeyError('property %s was not set'%(name,))
         else:
             return val
 
+    __getattr__ = __getitem__ = _get_val_
+
     def _get_unvalidated_val(self, name):
         """Return resolved but unvalidated value"""
         return Params._get_unvalidated_val(self, name)
 
+    def _rvd(self, name, default):
+        """ Polymorphic override of _rvd that treats keys deemed absent by __contains__ as absent. """
+        return self._rv(name) if (name in self) else default
+
 ## Abstract parameter validator class.
 class _ParamValidator(object):
     def __contains__(self, val):
@@ -780,7 +934,8 @@ class _type_range_incl(instanceof):
         instanceof.__init__(self, cls, noneokay)
         self._range = range_incl(begin, end)
     def __contains__(self, v):
-        return instanceof.__contains__(self, v) and (self._range.__contains__(v) or (self._noneokay and v is None))
+        # None is checked first because it can't be compared with numbers in python 3
+        return instanceof.__contains__(self, v) and ((self._noneokay and v is None) or self._range.__contains__(v))
 
 class integer(_type_range_incl):
     def __init__(self, begin=None, end=None, noneokay=False):
@@ -799,9 +954,9 @@ class decimalOrNone(decimal):
         decimal.__init__(self, begin, end, noneokay=True)
 
 def issequence(v):
-    if isinstance(v, basestring):
+    if isinstance(v, _string_types):
         return False
-    return isinstance(v, collections.Sequence)
+    return isinstance(v, Sequence)
 
 def isTupleOrList(v):
     return isinstance(v, tuple) or isinstance(v, list)
@@ -813,7 +968,7 @@ def isMutable(v):
     if isinstance(v, Properties):
         return (not v.isFrozen())
     else:
-        return isinstance(v, collections.MutableSequence) or isinstance(v, collections.MutableMapping) or isinstance(v, collections.MutableSet) or (issequence(v) and any([isMutable(e) for e in v]) )
+        return isinstance(v, MutableSequence) or isinstance(v, MutableMapping) or isinstance(v, MutableSet) or (issequence(v) and any([isMutable(e) for e in v]) )
 
 class iscallable(_ParamValidator):
     def __init__(self, lst=None, noneokay=False):
@@ -858,6 +1013,44 @@ mandatory = _mandatoryValidator()
 boolean = instanceof(bool, False)
 booleanOrNone = instanceofOrNone(bool)
 
+def _compile_validator(validator):
+    """
+    Compiles a validator into a tagged tuple that _passes_check evaluates with builtin isinstance()
+    calls and comparisons instead of python level __contains__ calls. Params validates both reads and
+    writes this way.
+    Only the stock validator classes are compiled - matched by exact type since subclasses may
+    override __contains__. All other validators are tagged 'in' and evaluated with the 'in' operator.
+    Returns None if the validator accepts all values.
+    """
+    cls = type(validator)
+    if (validator is None) or (cls is _anyok):
+        return None
+    elif cls is _mandatoryValidator:
+        return ('mandatory',)
+    elif cls in (instanceof, instanceofOrNone):
+        return ('instanceof', _accepted_types(validator))
+    elif cls in (integer, integerOrNone, decimal, decimalOrNone):
+        return ('range', _accepted_types(validator), validator._range._begin, validator._range._end)
+    else:
+        return ('in', validator)
+
+def _passes_check(check, val):
+    """ Evaluates a validator compiled by _compile_validator. Equivalent to 'val in validator'. """
+    tag = check[0]
+    if tag == 'instanceof':
+        return isinstance(val, check[1])
+    elif tag == 'range':
+        return isinstance(val, check[1]) and ((val is None) or (
+            (check[3] is None or val <= check[3]) and (check[2] is None or val >= check[2])))
+    elif tag == 'mandatory':
+        return val is not None
+    else:
+        return val in check[1]
+
+def _accepted_types(validator):
+    """ Types accepted by an instanceof validator, as a tuple that can be passed to isinstance. """
+    return (validator._cls, LambdaVal) + ((type(None),) if validator._noneokay else ())
+
 def squashed_seq_list(np_seq_batch, seq_lens, remove_val1=None, remove_val2=None, eos_token=0):
     assert np_seq_batch.ndim == 2
     assert seq_lens.ndim == 1
@@ -956,7 +1149,7 @@ def diff_dict(left, right):
     """ Assymetric comparison of left with right """
     f = {}
     f2 = {}
-    for k,v in left.iteritems():
+    for k,v in left.items():
         if k in right:
             v2 = right[k]
             if isinstance(v, dict) and isinstance(v2, dict):
@@ -1051,7 +1244,7 @@ def to_set(dict_obj, sep=' ===> '):
     derived by calling self.to_flat_dict.
 
     """
-    return set(['%s%s%s'%(e[0],sep,e[1]) for e in to_flat_dict(dict_obj).iteritems()])
+    return set(['%s%s%s'%(e[0],sep,e[1]) for e in to_flat_dict(dict_obj).items()])
 
 # def to_set(self):
 #     """
@@ -1100,8 +1293,8 @@ def diff_table(dict_obj, other):
     head_keys = keys - tail_keys ## filter(lambda k: k not in tail_keys, keys)
     keys = sorted(list(head_keys)) + sorted(list(tail_keys))
 
-    np_head = np.asarray([ ['%s%s%s'%(k, sep, d1[k] if d1.has_key(k) else 'undefined') , '%s%s%s'%(k,sep,d2[k] if d2.has_key(k) else 'undefined')] for k in head_keys ]).reshape(-1,2)
-    np_tail = np.asarray([ ['%s%s%s'%(k, sep, d1[k] if d1.has_key(k) else 'undefined') , '%s%s%s'%(k,sep,d2[k] if d2.has_key(k) else 'undefined')] for k in tail_keys ]).reshape(-1,2)
+    np_head = np.asarray([ ['%s%s%s'%(k, sep, d1[k] if (k in d1) else 'undefined') , '%s%s%s'%(k,sep,d2[k] if (k in d2) else 'undefined')] for k in head_keys ]).reshape(-1,2)
+    np_tail = np.asarray([ ['%s%s%s'%(k, sep, d1[k] if (k in d1) else 'undefined') , '%s%s%s'%(k,sep,d2[k] if (k in d2) else 'undefined')] for k in tail_keys ]).reshape(-1,2)
 
     return np_head, np_tail
 
@@ -1120,4 +1313,14 @@ def static_vars(**kwargs):
 
 
 def get_dupes(lst):
-    return set([item for item in lst if lst.count(item) > 1])
\ No newline at end of file
+    return set([item for item in lst if lst.count(item) > 1])
+
+def _warm_up():
+    """
+    Constructs, writes and reads a throwaway Params object so that one-time costs of the first use
+    (e.g. populating the type attribute caches of the accessors) are paid at import time.
+    """
+    params = Params((ParamDesc('_a', '_', integer(), 0), ParamDesc('_b', '_', None, 'x')))
+    params['_a'] = 1
+    params._b = params._a
+_warm_up()
@@ -24,6 +24,11 @@ Works on python 2.7
 """
 
 import unittest
+import copy
+try:
+    import numba
+except ImportError:
+    numba = None
 import dl_commons as dlc
 from dl_commons import PD, LambdaVal, integer, integerOrNone, instanceof, equalto
 #import tf_commons as tfc
@@ -199,6 +204,11 @@ class PropertiesTest(TestCaseBase):
         self.assertRaises(KeyError, getattr, sealed, "x")
         self.assertRaises(KeyError, self.dictGet, sealed, "x")
 
+        # dict.update bypasses the name check on write, but reads still reject undeclared names
+        updated = dlc.Params(proto).updated({'x': 1})
+        self.assertRaises(KeyError, getattr, updated, "x")
+        self.assertRaises(KeyError, updated.to_picklable_dict)
+
     def test_good_hyperparams(self):
         sealed = dlc.HyperParams((
                 dlc.ParamDesc('model_name', 'Name of Model', None, 'im2latex'),
@@ -221,6 +231,17 @@ class PropertiesTest(TestCaseBase):
         self.assertEqual(frozen['none'], None)
         self.assertEqual(sealed.none, None)
         self.assertEqual(sealed['none'], None)
+        self.assertTrue('model_name' in sealed)
+        self.assertTrue('none' in sealed)
+        self.assertTrue('num_layers' in frozen)
+        self.assertFalse('num_layers' in sealed)
+        self.assertFalse('x' in sealed)
+        # Undeclared keys inserted via dict.update are absent as well
+        hp = dlc.HyperParams((dlc.ParamDesc('a', '', integer(), 1),))
+        hp.updated({'x': 1, 'y': None})
+        self.assertFalse('x' in hp)
+        self.assertFalse('y' in hp)
+        self.assertRaises(KeyError, getattr, hp, 'x')
 
     def test_bad_hyperparams(self):
         sealed = dlc.HyperParams((
@@ -245,6 +266,88 @@ class PropertiesTest(TestCaseBase):
         self.assertRaises(KeyError, getattr, sealed, 'layer_type')
 
 
+    def test_invalid_defaults(self):
+        self.assertRaises(dlc.ParamsValueError, dlc.ParamDesc, 'a', '', dlc.mandatory, None)
+        self.assertRaises(dlc.ParamsValueError, dlc.ParamDesc, 'a', '', integer(), None)
+        self.assertRaises(dlc.ParamsValueError, dlc.ParamDesc, 'a', '', integer(1, 5), 10)
+        self.assertRaises(dlc.ParamsValueError, dlc.ParamDesc, 'a', '', ['CNN', 'MLP'], 'SVM')
+        # Valid defaults and LambdaVals are accepted
+        dlc.ParamDesc('a', '', integerOrNone(), None)
+        dlc.ParamDesc('a', '', integer(1, 5), 5)
+        dlc.ParamDesc('a', '', integer(1, 5), LambdaVal(lambda _, __: 10))
+
+    def test_compiled_validators(self):
+        """ Params must accept and reject exactly the values that the validator itself does. """
+        validators = (dlc.mandatory, dlc.boolean, dlc.booleanOrNone,
+                      integer(), integer(1, 10), integerOrNone(1, 10),
+                      dlc.decimal(), dlc.decimal(0., 3.), dlc.decimalOrNone(0., 3.),
+                      instanceof((int, str)), dlc.instanceofOrNone((float, str)),
+                      dlc._anyok(), dlc.iscallable(), ['a', 1, None])
+        vals = (None, True, False, 0, 1, 5, 10, 11, -1, 0., 2.5, 3., 3.5, 'a', 'x', (1,), len)
+        for validator in validators:
+            params = dlc.Params((dlc.ParamDesc('p', '', validator),))
+            for val in vals:
+                expected = val in validator
+                try:
+                    params.p = val
+                    accepted = True
+                except dlc.ParamsValueError:
+                    accepted = False
+                self.assertEqual(accepted, expected, 'write %r, %r' % (validator, val))
+
+                if val is not None: # None values are not validated on read
+                    params = dlc.Params((dlc.ParamDesc('p', '', validator),)).updated({'p': val})
+                    try:
+                        params.p
+                        accepted = True
+                    except dlc.ParamsValueError:
+                        accepted = False
+                    self.assertEqual(accepted, expected, 'read %r, %r' % (validator, val))
+
+    @unittest.skipUnless(numba is not None, 'numba is not installed')
+    def test_numba_dict(self):
+        params = dlc.Params((
+            dlc.ParamDesc('model_name', 'Name of Model', None, 'im2latex'),
+            dlc.ParamDesc('num_layers', 'Number of layers to create', integer(1, 10), 2),
+            dlc.ParamDesc('dropout', 'Dropout rate', dlc.decimal(0., 1.), 0.5),
+            dlc.ParamDesc('use_bias', 'Add a bias', dlc.boolean, True),
+            dlc.ParamDesc('unset', 'Unset property', integer(1, 10))
+        )).freeze()
+        d = params.to_numba_dict()
+        self.assertEqual(sorted(d.keys()), ['dropout', 'num_layers', 'use_bias'])
+        self.assertEqual(d['num_layers'], 2.)
+        self.assertEqual(d['dropout'], 0.5)
+        self.assertEqual(d['use_bias'], 1.)
+        self.assertTrue(params.to_numba_dict() is d)
+
+        # updated() modifies even frozen objects, hence must discard the cached dict
+        params.updated({'num_layers': 3})
+        self.assertEqual(params.to_numba_dict()['num_layers'], 3.)
+
+    def test_copy(self):
+        props = dlc.Properties({'model_name': 'im2latex'}).seal()
+        props_copy = copy.copy(props)
+        self.assertEqual(type(props_copy), dlc.Properties)
+        self.assertEqual(props_copy.model_name, 'im2latex')
+        self.assertTrue(props_copy.isSealed())
+        self.assertRaises(dlc.AccessDeniedError, setattr, props_copy, "x", "MyNeuralNetwork")
+
+        frozen = dlc.HyperParams((
+            dlc.ParamDesc('model_name', 'Name of Model', None, 'im2latex'),
+            dlc.ParamDesc('num_layers', 'Number of layers to create', range(1, 11)),
+            dlc.ParamDesc('unset', 'Unset property', range(1, 11))
+        ), {'num_layers': 10}).freeze()
+        params_copy = copy.copy(frozen)
+        self.assertEqual(type(params_copy), dlc.HyperParams)
+        self.assertFalse(params_copy.isFrozen())
+        self.assertEqual(params_copy.num_layers, 10)
+        self.assertRaises(KeyError, getattr, params_copy, 'unset')
+        self.assertRaises(dlc.OneValError, setattr, params_copy, 'num_layers', 5)
+        self.assertRaises(ValueError, setattr, params_copy, 'unset', 11)
+        params_copy.unset = 5
+        self.assertEqual(params_copy.unset, 5)
+        self.assertRaises(KeyError, getattr, frozen, 'unset')
+
     def test_lambda_vals(self):
         p = Props()
         p2 = Props2(p)
@@ -22,6 +22,7 @@ Created on Mon Jul 17 19:58:00 2017
 
 @author: Sumeet S Singh
 """
+from __future__ import print_function
 import os
 import itertools
 import collections
@@ -624,7 +625,7 @@ class VisualizeDir(object):
             else:
                 T = min(T, words)
         if Ts is None:
-            Ts = xrange(T)
+            Ts = range(T)
 
         assert nd_alpha.shape[2] >= T, 'nd_alpha.shape == %s, T == %d'%(nd_alpha.shape, T)
         df = self.df_train_images if graph == 'training' else self._df_valid_images if graph == 'validation' else self._df_test_images
@@ -692,7 +693,7 @@ class VisualizeDir(object):
 
         epoch_steps = [get_step(f) for f in os.listdir(self._storedir) if f.startswith('validation')]
         epoch_steps = sorted(list(set(epoch_steps)))
-        print 'epoch_steps: %s'%epoch_steps
+        print('epoch_steps: %s'%epoch_steps)
         if len(epoch_steps) <= save_epochs:
             print('Only %d full epochs were found. Deleting nothing.'%len(epoch_steps))
             return False
@@ -705,12 +706,12 @@ class VisualizeDir(object):
             files_to_remove = set([f for f in training_files if (get_step(f) in steps_to_remove)])
             files_to_keep = set([f for f in os.listdir(self._storedir)]) - files_to_remove
             if dry_run:
-                print '%d files will be kept\n'%len(files_to_keep), pd.Series(sorted(list(files_to_keep), key=get_sort_order))
-                print '%d files will be removed\n'%len(files_to_remove), pd.Series(sorted(list(files_to_remove), key=get_sort_order))
+                print('%d files will be kept\n'%len(files_to_keep), pd.Series(sorted(list(files_to_keep), key=get_sort_order)))
+                print('%d files will be removed\n'%len(files_to_remove), pd.Series(sorted(list(files_to_remove), key=get_sort_order)))
             else:
                 for f in files_to_remove:
                     os.remove(os.path.join(self._storedir, f))
-                print 'Removed %d files\n'%len(files_to_remove), pd.Series(sorted(list(files_to_remove), key=get_step))
+                print('Removed %d files\n'%len(files_to_remove), pd.Series(sorted(list(files_to_remove), key=get_step)))
 
     def prune_snapshots(self, keep_first=None, keep_last=None, dry_run=True):
         """ Keep the latest 'save' snapshots. Delete the rest. """
@@ -729,19 +730,19 @@ class VisualizeDir(object):
 
         steps_to_remove = set(steps) - steps_to_keep
         if len(steps_to_remove) <= 0:
-            print 'Nothing to Delete'
+            print('Nothing to Delete')
             return
-        print 'steps to keep: ', sorted(list(steps_to_keep))
-        print 'steps to remove: ', sorted(list(steps_to_remove))
+        print('steps to keep: ', sorted(list(steps_to_keep)))
+        print('steps to remove: ', sorted(list(steps_to_remove)))
         files_to_remove = [f for f in files if (get_step(f) not in steps_to_keep) ]
         files_to_remove = sorted(files_to_remove, key=get_step)
 
         if dry_run:
-            print '%d files will be removed\n'%len(files_to_remove), pd.Series(files_to_remove)
+            print('%d files will be removed\n'%len(files_to_remove), pd.Series(files_to_remove))
         else:
             for f in files_to_remove:
                 os.remove(os.path.join(self._logdir, f))
-            print '%d files removed\n'%len(files_to_remove), pd.Series(files_to_remove)
+            print('%d files removed\n'%len(files_to_remove), pd.Series(files_to_remove))
 
 
 class VisualizeStep():
@@ -875,10 +876,10 @@ class Table(object):
         deduped_index = None
 
         if index_values is not None:
-            for k,v in index_values.iteritems():
+            for k,v in index_values.items():
                 d2[k] = v
 
-        for k, v in d.iteritems():
+        for k, v in d.items():
             if k in d2:
                 print('WARNING: Duplicate values for tag %s at step %s\n(%s,\n%s)\nOverwriting values' % (k, index, d2[k], v))
 
@@ -996,8 +997,8 @@ class EvalRuns(dlc.Properties):
         self.args.update(zip(self._logdirs, args))
 
         metrics_n_cols = [self.get_metrics(logdir, hypers[i], metric_names) for (i, logdir) in enumerate(self._logdirs)]
-        metric_cols = zip(*metrics_n_cols)[1]
-        metrics = zip(*metrics_n_cols)[0]
+        metric_cols = list(zip(*metrics_n_cols))[1]
+        metrics = list(zip(*metrics_n_cols))[0]
         self.metrics = {}
         self.metrics.update(zip(self._logdirs, metrics))
 
@@ -1080,7 +1081,7 @@ class EvalRuns(dlc.Properties):
         def insert_vals(row, df, tag_exp, op, selected_id=None):
             all_tags = set(df.columns)
             colsort = []
-            tags = filter(lambda tag: bool(re.search(tag_exp, tag)), all_tags)
+            tags = list(filter(lambda tag: bool(re.search(tag_exp, tag)), all_tags))
             split_op = op.split('_')
             if split_op[0] == 'select':
                 assert len(tags) == 1, 'tag_exp %s_%s maps to %d tags. Must map to exactly one.'%(op, tag_exp, len(tags))
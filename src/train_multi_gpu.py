@@ -125,15 +125,15 @@ class Accumulator(dlc.Properties):
         dlc.Properties.__init__(self)
         self.reset()
     def reset(self):
-        for k in self.keys():
+        for k in list(self.keys()):
             del self[k]
     def append(self, d):
-        for k, v in d.iteritems():
+        for k, v in d.items():
             if k not in self:
                 self[k] = []
             self[k].append(v)
     def extend(self, d):
-        for k, v in d.iteritems():
+        for k, v in d.items():
             if k not in self:
                 self[k] = []
             self[k].extend(v)